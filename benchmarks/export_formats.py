@@ -0,0 +1,67 @@
+"""Compare export throughput and output size per format.
+
+Run from the repository root:
+
+    python -m benchmarks.export_formats --rows 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.time_tracker.database import Database
+from src.time_tracker.export import WRITERS
+
+
+WORDS = ["fixed", "reviewed", "meeting", "deploy", "refactor", "login", "report",
+         "design", "tests", "client", "invoice", "bug", "feature", "docs, notes", '"quoted"']
+
+
+def populate(db: Database, rows: int, projects: int, seed: int) -> None:
+    """Fill the database with random time entries"""
+    rng = random.Random(seed)
+    for i in range(projects):
+        db.create_project(f"Project {i + 1}")
+    inserted = db.create_time_entries(
+        (
+            rng.randint(1, projects),
+            rng.randint(5, 480),
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 12))),
+            f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        )
+        for _ in range(rows)
+    )
+    if inserted != rows:
+        raise SystemExit(f"Inserted {inserted} of {rows} time entries")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000, help="Number of time entries")
+    parser.add_argument("--projects", type=int, default=20, help="Number of projects")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per format; the best is reported")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generated data")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.sqlite"))
+        populate(db, args.rows, args.projects, args.seed)
+
+        print(f"{'format':<10} {'rows/sec':>12} {'bytes':>12} {'bytes/row':>10}")
+        for fmt in sorted(WRITERS):
+            filename = os.path.join(tmp, "export" + WRITERS[fmt].extension)
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                count = db.export(filename, fmt)
+                elapsed = time.perf_counter() - start
+                if count is None:
+                    raise SystemExit(f"Export to {fmt} failed")
+                best = elapsed if best is None else min(best, elapsed)
+            size = os.path.getsize(filename)
+            print(f"{fmt:<10} {count / best:>12,.0f} {size:>12,} {size / max(count, 1):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
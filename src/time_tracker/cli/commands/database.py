@@ -0,0 +1,24 @@
+import click
+
+
+@click.group()
+def db():
+    """Database maintenance commands"""
+    pass
+
+
+@db.command("dedupe")
+@click.option("--yes", is_flag=True, help="Remove duplicates without asking for confirmation")
+@click.pass_context
+def db_dedupe(ctx, yes):
+    """Remove duplicate time entries"""
+    database = ctx.obj['db']
+    
+    duplicates = database.count_duplicate_time_entries()
+    if not duplicates:
+        click.echo("No duplicate time entries found.")
+        return
+    
+    if yes or click.confirm(f"Found {duplicates} duplicate time entries. Remove them?"):
+        removed = database.dedupe_time_entries()
+        click.echo(f"Removed {removed} duplicate time entries.")
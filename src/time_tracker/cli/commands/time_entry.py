@@ -1,5 +1,28 @@
 import click
 from datetime import date
+from ...export import WRITERS
+
+
+class ExportFormat(click.ParamType):
+    """Export format choice, read from the writer registry when the command runs
+    
+    Writers registered after this module is imported can still be selected.
+    """
+    
+    name = "format"
+    
+    def get_metavar(self, param, ctx=None):
+        return f"[{'|'.join(sorted(WRITERS))}]"
+    
+    def convert(self, value, param, ctx):
+        if value in WRITERS:
+            return value
+        self.fail(f"{value!r} is not one of {', '.join(sorted(WRITERS))}.", param, ctx)
+
+
+def _iso_date(value):
+    """Convert an optional click.DateTime value to a YYYY-MM-DD string"""
+    return value.date().isoformat() if value else None
 
 
 @click.group()
@@ -13,8 +36,10 @@ def time():
 @click.argument("duration", type=int, required=False)
 @click.argument("description", required=False)
 @click.option("--date", default=None, help="Date for the entry (YYYY-MM-DD). Defaults to today.")
+@click.option("--external-id", default=None, help="Id from an external system; an entry with the same id is only added once.")
+@click.option("--dedupe", is_flag=True, help="Key the entry by its project, date, duration and description and skip it if that key exists. Only entries added with --dedupe or keyed by 'db dedupe' are matched.")
 @click.pass_context
-def time_add(ctx, project_id, duration, description, date):
+def time_add(ctx, project_id, duration, description, date, external_id, dedupe):
     """Add a new time entry to a project"""
     db = ctx.obj['db']
     
@@ -41,28 +66,36 @@ def time_add(ctx, project_id, duration, description, date):
     if not description:
         description = click.prompt("Description")
     
-    if db.create_time_entry(project_id, duration, description, date):
+    created = db.create_time_entry(project_id, duration, description, date, external_id, dedupe)
+    if created:
         click.echo(f"Time entry added: {duration} minutes for project '{project[1]}'")
-    else:
+    elif created is None:
         click.echo("Failed to add time entry.")
+    else:
+        click.echo("Time entry already exists, skipped.")
 
 
 @time.command("list")
 @click.option("--project-id", type=int, help="Filter by project ID")
+@click.option("--start-date", type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Only entries on or after this date (YYYY-MM-DD)")
+@click.option("--end-date", type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Only entries on or before this date (YYYY-MM-DD)")
 @click.pass_context
-def time_list(ctx, project_id):
+def time_list(ctx, project_id, start_date, end_date):
     """List time entries"""
     db = ctx.obj['db']
+    start_date, end_date = _iso_date(start_date), _iso_date(end_date)
     
     if project_id:
-        entries = db.get_time_entries_by_project(project_id)
+        entries = db.get_time_entries_by_project(project_id, start_date, end_date)
         project = db.get_project_by_id(project_id)
         if not project:
             click.echo(f"Project {project_id} not found.")
             return
         click.echo(f"Time entries for project '{project[1]}':")
     else:
-        entries = db.get_all_time_entries()
+        entries = db.get_all_time_entries(start_date, end_date)
         click.echo("All time entries:")
     
     if not entries:
@@ -121,8 +154,11 @@ def time_update(ctx, entry_id, duration, description, date):
     if date is None:
         date = click.prompt("New date (YYYY-MM-DD)", default=entry[4])
     
-    if db.update_time_entry(entry_id, duration, description, date):
+    updated = db.update_time_entry(entry_id, duration, description, date)
+    if updated:
         click.echo(f"Time entry {entry_id} updated successfully.")
+    elif updated is None:
+        click.echo(f"Time entry {entry_id} not updated: the new values duplicate an existing entry.")
     else:
         click.echo(f"Failed to update time entry {entry_id}.")
 
@@ -201,30 +237,37 @@ def time_summary(ctx, project_id):
 
 @time.command("export")
 @click.argument("filename", required=False)
+@click.option("--format", "fmt", type=ExportFormat(), default="csv", show_default=True,
+              help="Output format")
 @click.option("--project-id", type=int, help="Export only entries for specific project")
+@click.option("--start-date", type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Only entries on or after this date (YYYY-MM-DD)")
+@click.option("--end-date", type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Only entries on or before this date (YYYY-MM-DD)")
 @click.pass_context
-def time_export(ctx, filename, project_id):
-    """Export time entries to CSV file"""
+def time_export(ctx, filename, fmt, project_id, start_date, end_date):
+    """Export time entries to a CSV, JSON Lines or MessagePack file"""
     db = ctx.obj['db']
+    start_date, end_date = _iso_date(start_date), _iso_date(end_date)
+    extension = WRITERS[fmt].extension
     
     if not filename:
-        filename = click.prompt("CSV filename")
+        filename = click.prompt(f"{fmt.upper()} filename")
     
-    if not filename.endswith('.csv'):
-        filename += '.csv'
+    if not filename.endswith(extension):
+        filename += extension
     
     if project_id:
         project = db.get_project_by_id(project_id)
         if not project:
             click.echo(f"Project {project_id} not found.")
             return
-        
-        if db.export_to_csv(filename, project_id):
-            click.echo(f"Time entries for project '{project[1]}' exported to {filename}")
-        else:
-            click.echo("Failed to export CSV file.")
+        scope = f"Time entries for project '{project[1]}'"
     else:
-        if db.export_to_csv(filename):
-            click.echo(f"All time entries exported to {filename}")
-        else:
-            click.echo("Failed to export CSV file.")
\ No newline at end of file
+        scope = "All time entries"
+    
+    count = db.export(filename, fmt, project_id, start_date, end_date)
+    if count is None:
+        click.echo(f"Failed to export {fmt.upper()} file.")
+    else:
+        click.echo(f"{scope} exported to {filename} ({count} rows)")
@@ -1,6 +1,7 @@
 import click
 from ..config import Config
 from ..database import Database
+from .commands.database import db
 from .commands.project import project
 from .commands.time_entry import time
 
@@ -16,6 +17,7 @@ def cli(ctx):
 
 cli.add_command(project)
 cli.add_command(time)
+cli.add_command(db)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,26 @@
 import sqlite3
 import os
-import csv
-from typing import List, Optional, Tuple
+import hashlib
+from typing import Iterable, Iterator, List, Optional, Tuple
+from ..export import COLUMNS, get_writer, typed_row
 from ..models import Project, TimeEntry
 
 
+def content_key(project_id: int, entry_date: str, duration_minutes: int, description: str) -> str:
+    """Build an idempotency key from the content of a time entry"""
+    content = "\x1f".join(str(value) for value in (project_id, entry_date, duration_minutes, description))
+    return "sha256:" + hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def external_key(external_id: str) -> str:
+    """Build an idempotency key from an id assigned by an external system"""
+    return f"ext:{external_id}"
+
+
+# Entries that may be collapsed by dedupe: unkeyed or keyed by their content
+CONTENT_KEYED = "(idempotency_key IS NULL OR idempotency_key LIKE 'sha256:%')"
+
+
 class Database:
     """Database class for managing SQLite operations"""
     
@@ -38,10 +54,21 @@ class Database:
                     description TEXT NOT NULL,
                     entry_date DATE DEFAULT CURRENT_DATE,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    idempotency_key TEXT,
                     FOREIGN KEY (project_id) REFERENCES projects (id)
                 )
             """)
             
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(time_entries)")]
+            if "idempotency_key" not in columns:
+                conn.execute("ALTER TABLE time_entries ADD COLUMN idempotency_key TEXT")
+            
+            # NULL keys never conflict, so entries added without a key are unaffected
+            conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_time_entries_idempotency_key
+                ON time_entries (idempotency_key)
+            """)
+            
             conn.commit()
     
     # Project methods
@@ -99,24 +126,86 @@ class Database:
             return cursor.rowcount > 0
     
     # Time entry methods
+    def _connect_keyed(self) -> sqlite3.Connection:
+        """Open a connection with content_key() available as an SQL function"""
+        conn = sqlite3.connect(self.db_path)
+        conn.create_function("content_key", 4, content_key, deterministic=True)
+        return conn
+    
+    def _idempotency_key(self, project_id: int, duration_minutes: int, description: str,
+                         entry_date: Optional[str], external_id: Optional[str],
+                         dedupe: bool) -> Optional[str]:
+        """Resolve the idempotency key for a new time entry, if one was requested
+        
+        Content keys need the entry date, so callers resolve a missing date first.
+        """
+        if external_id:
+            return external_key(external_id)
+        if dedupe:
+            return content_key(project_id, entry_date, duration_minutes, description)
+        return None
+    
     def create_time_entry(self, project_id: int, duration_minutes: int, 
-                         description: str, entry_date: Optional[str] = None) -> bool:
-        """Create a new time entry"""
+                         description: str, entry_date: Optional[str] = None,
+                         external_id: Optional[str] = None, dedupe: bool = False) -> Optional[bool]:
+        """Create a new time entry
+        
+        When an external id is given, or dedupe is set, the entry is keyed and
+        skipped if an entry with the same key already exists. Returns True when
+        the entry was inserted, False when it was skipped as a duplicate and
+        None when the insert failed.
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
+                if dedupe and not external_id and not entry_date:
+                    entry_date = conn.execute("SELECT CURRENT_DATE").fetchone()[0]
+                key = self._idempotency_key(project_id, duration_minutes, description,
+                                            entry_date, external_id, dedupe)
                 if entry_date:
-                    conn.execute(
-                        "INSERT INTO time_entries (project_id, duration_minutes, description, entry_date) VALUES (?, ?, ?, ?)",
-                        (project_id, duration_minutes, description, entry_date)
+                    cursor = conn.execute(
+                        "INSERT INTO time_entries (project_id, duration_minutes, description, entry_date, idempotency_key) VALUES (?, ?, ?, ?, ?) ON CONFLICT (idempotency_key) DO NOTHING",
+                        (project_id, duration_minutes, description, entry_date, key)
                     )
                 else:
-                    conn.execute(
-                        "INSERT INTO time_entries (project_id, duration_minutes, description) VALUES (?, ?, ?)",
-                        (project_id, duration_minutes, description)
+                    cursor = conn.execute(
+                        "INSERT INTO time_entries (project_id, duration_minutes, description, idempotency_key) VALUES (?, ?, ?, ?) ON CONFLICT (idempotency_key) DO NOTHING",
+                        (project_id, duration_minutes, description, key)
                     )
-                return True
+                return cursor.rowcount > 0
         except sqlite3.IntegrityError:
-            return False
+            return None
+    
+    def create_time_entries(self, entries: Iterable[Tuple], dedupe: bool = False) -> Optional[int]:
+        """Bulk insert (project_id, duration_minutes, description, entry_date[, external_id]) tuples
+        
+        Keys are assigned as in create_time_entry and entries whose key already
+        exists are skipped. Returns the number of rows actually inserted, or
+        None when any entry fails to insert, in which case none are inserted.
+        """
+        try:
+            return self._insert_time_entries(entries, dedupe)
+        except sqlite3.IntegrityError:
+            return None
+    
+    def _insert_time_entries(self, entries: Iterable[Tuple], dedupe: bool) -> int:
+        """Insert keyed time entries in a single transaction"""
+        with sqlite3.connect(self.db_path) as conn:
+            today = conn.execute("SELECT CURRENT_DATE").fetchone()[0]
+            rows = []
+            for entry in entries:
+                project_id, duration_minutes, description, entry_date = entry[:4]
+                external_id = entry[4] if len(entry) > 4 else None
+                entry_date = entry_date or today
+                key = self._idempotency_key(project_id, duration_minutes, description,
+                                            entry_date, external_id, dedupe)
+                rows.append((project_id, duration_minutes, description, entry_date, key))
+            
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO time_entries (project_id, duration_minutes, description, entry_date, idempotency_key) VALUES (?, ?, ?, ?, ?) ON CONFLICT (idempotency_key) DO NOTHING",
+                rows
+            )
+            return conn.total_changes - before
     
     def get_time_entry_by_id(self, entry_id: int) -> Optional[Tuple]:
         """Get time entry by ID"""
@@ -127,32 +216,68 @@ class Database:
             )
             return cursor.fetchone()
     
-    def get_time_entries_by_project(self, project_id: int) -> List[Tuple]:
+    def _time_entry_filters(self, project_id: Optional[int] = None,
+                            start_date: Optional[str] = None,
+                            end_date: Optional[str] = None) -> Tuple[str, List]:
+        """Build the WHERE clause shared by time entry listings and exports
+        
+        Dates are YYYY-MM-DD strings; stored dates that are not valid dates never match.
+        """
+        conditions = []
+        values = []
+        
+        if project_id:
+            conditions.append("te.project_id = ?")
+            values.append(project_id)
+        
+        if start_date:
+            conditions.append("date(te.entry_date) >= ?")
+            values.append(start_date)
+        
+        if end_date:
+            conditions.append("date(te.entry_date) <= ?")
+            values.append(end_date)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, values
+    
+    def get_time_entries_by_project(self, project_id: int, start_date: Optional[str] = None,
+                                    end_date: Optional[str] = None) -> List[Tuple]:
         """Get all time entries for a project"""
+        where, values = self._time_entry_filters(project_id, start_date, end_date)
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
-                "SELECT id, project_id, duration_minutes, description, entry_date, created_at FROM time_entries WHERE project_id = ? ORDER BY entry_date DESC",
-                (project_id,)
+                f"SELECT te.id, te.project_id, te.duration_minutes, te.description, te.entry_date, te.created_at FROM time_entries te {where} ORDER BY te.entry_date DESC",
+                values
             )
             return cursor.fetchall()
     
-    def get_all_time_entries(self) -> List[Tuple]:
+    def get_all_time_entries(self, start_date: Optional[str] = None,
+                             end_date: Optional[str] = None) -> List[Tuple]:
         """Get all time entries with project names"""
+        where, values = self._time_entry_filters(None, start_date, end_date)
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
-                """SELECT te.id, te.project_id, p.name as project_name, te.duration_minutes, 
+                f"""SELECT te.id, te.project_id, p.name as project_name, te.duration_minutes, 
                    te.description, te.entry_date, te.created_at 
                    FROM time_entries te 
                    JOIN projects p ON te.project_id = p.id 
-                   ORDER BY te.entry_date DESC"""
+                   {where}
+                   ORDER BY te.entry_date DESC""",
+                values
             )
             return cursor.fetchall()
     
     def update_time_entry(self, entry_id: int, duration_minutes: Optional[int] = None, 
-                         description: Optional[str] = None, entry_date: Optional[str] = None) -> bool:
-        """Update time entry"""
+                         description: Optional[str] = None, entry_date: Optional[str] = None) -> Optional[bool]:
+        """Update time entry
+        
+        A content key is recomputed from the new values; external keys are kept.
+        Returns False if the entry was not found, or None if the new values
+        duplicate another keyed entry and the update was not applied.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect_keyed() as conn:
                 updates = []
                 values = []
                 
@@ -171,13 +296,27 @@ class Database:
                 if not updates:
                     return False
                 
+                # SET expressions see the old row, so new values are bound again for the key
+                key_args = ["project_id"]
+                for column, value in (("entry_date", entry_date), ("duration_minutes", duration_minutes),
+                                      ("description", description)):
+                    if value is None:
+                        key_args.append(column)
+                    else:
+                        key_args.append("?")
+                        values.append(value)
+                updates.append(
+                    "idempotency_key = CASE WHEN idempotency_key LIKE 'sha256:%' "
+                    f"THEN content_key({', '.join(key_args)}) ELSE idempotency_key END"
+                )
+                
                 values.append(entry_id)
                 query = f"UPDATE time_entries SET {', '.join(updates)} WHERE id = ?"
                 
                 cursor = conn.execute(query, values)
                 return cursor.rowcount > 0
         except sqlite3.IntegrityError:
-            return False
+            return None
     
     def delete_time_entry(self, entry_id: int) -> bool:
         """Delete time entry"""
@@ -195,36 +334,90 @@ class Database:
             result = cursor.fetchone()
             return result[0] if result[0] is not None else 0
     
-    def export_to_csv(self, filename: str, project_id: Optional[int] = None) -> bool:
-        """Export time entries to CSV file"""
+    def count_duplicate_time_entries(self) -> int:
+        """Count time entries that duplicate the content of an earlier entry
+        
+        Entries keyed by an external id are never counted as duplicates.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                f"""SELECT COALESCE(SUM(n - 1), 0) FROM (
+                       SELECT COUNT(*) AS n FROM time_entries
+                       WHERE {CONTENT_KEYED}
+                       GROUP BY project_id, entry_date, duration_minutes, description
+                       HAVING n > 1
+                   )"""
+            )
+            return cursor.fetchone()[0]
+    
+    def dedupe_time_entries(self) -> int:
+        """Delete time entries that duplicate an earlier entry, returning the number removed
+        
+        Entries are duplicates when project, date, duration and description all
+        match. Entries keyed by an external id are always kept, so their keys
+        keep blocking replays. Each remaining group keeps its content-keyed
+        entry, or else its earliest entry, and every surviving entry without a
+        key is given its content key so later --dedupe adds match it.
+        """
+        with self._connect_keyed() as conn:
+            cursor = conn.execute(
+                f"""DELETE FROM time_entries WHERE {CONTENT_KEYED} AND id NOT IN (
+                       SELECT COALESCE(MIN(CASE WHEN idempotency_key IS NOT NULL THEN id END), MIN(id))
+                       FROM time_entries
+                       WHERE {CONTENT_KEYED}
+                       GROUP BY project_id, entry_date, duration_minutes, description
+                   )"""
+            )
+            removed = cursor.rowcount
+            conn.execute(
+                """UPDATE OR IGNORE time_entries
+                   SET idempotency_key = content_key(project_id, entry_date, duration_minutes, description)
+                   WHERE idempotency_key IS NULL"""
+            )
+            return removed
+    
+    def iter_export_rows(self, project_id: Optional[int] = None, start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> Iterator[Tuple]:
+        """Stream typed time entry rows for export without loading them all"""
+        where, values = self._time_entry_filters(project_id, start_date, end_date)
+        conn = sqlite3.connect(self.db_path)
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                if project_id:
-                    cursor = conn.execute(
-                        """SELECT te.id, p.name as project_name, te.duration_minutes, 
-                           te.description, te.entry_date, te.created_at 
-                           FROM time_entries te 
-                           JOIN projects p ON te.project_id = p.id 
-                           WHERE te.project_id = ?
-                           ORDER BY te.entry_date DESC""",
-                        (project_id,)
-                    )
-                else:
-                    cursor = conn.execute(
-                        """SELECT te.id, p.name as project_name, te.duration_minutes, 
-                           te.description, te.entry_date, te.created_at 
-                           FROM time_entries te 
-                           JOIN projects p ON te.project_id = p.id 
-                           ORDER BY te.entry_date DESC"""
-                    )
-                
-                data = cursor.fetchall()
-                
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(['ID', 'Project', 'Duration (minutes)', 'Description', 'Date', 'Created At'])
-                    writer.writerows(data)
-                
-                return True
-        except Exception:
-            return False
\ No newline at end of file
+            cursor = conn.execute(
+                f"""SELECT te.id, p.name as project_name, te.duration_minutes, 
+                   te.description, te.entry_date, te.created_at 
+                   FROM time_entries te 
+                   JOIN projects p ON te.project_id = p.id 
+                   {where}
+                   ORDER BY te.entry_date DESC""",
+                values
+            )
+            for row in cursor:
+                yield typed_row(row)
+        finally:
+            conn.close()
+    
+    def export(self, filename: str, fmt: str = "csv", project_id: Optional[int] = None,
+               start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[int]:
+        """Export time entries in the given format, returning the row count or None on failure
+        
+        A partially written file is removed when the export fails.
+        """
+        try:
+            writer_class = get_writer(fmt)
+        except ValueError:
+            return None
+        
+        rows = self.iter_export_rows(project_id, start_date, end_date)
+        opened = False
+        try:
+            with open(filename, **writer_class.open_kwargs()) as f:
+                opened = True
+                writer = writer_class(f, COLUMNS)
+                writer.write_header()
+                return writer.write_rows(rows)
+        except (OSError, sqlite3.Error, ValueError):
+            if opened and os.path.exists(filename):
+                os.remove(filename)
+            return None
+        finally:
+            rows.close()
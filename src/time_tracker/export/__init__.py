@@ -0,0 +1,23 @@
+from .writers import (
+    COLUMNS,
+    WRITERS,
+    CsvWriter,
+    ExportWriter,
+    JsonLinesWriter,
+    MsgpackWriter,
+    get_writer,
+    register_writer,
+    typed_row,
+)
+
+__all__ = [
+    'COLUMNS',
+    'WRITERS',
+    'CsvWriter',
+    'ExportWriter',
+    'JsonLinesWriter',
+    'MsgpackWriter',
+    'get_writer',
+    'register_writer',
+    'typed_row',
+]
@@ -0,0 +1,244 @@
+import csv
+import json
+import struct
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timezone
+from typing import IO, Any, Dict, Iterable, List, Sequence, Type
+
+
+COLUMNS = ['id', 'project', 'duration_minutes', 'description', 'entry_date', 'created_at']
+
+
+def _parse_date(value: Any) -> Any:
+    """Convert an SQLite DATE string to a date, leaving other values untouched"""
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _parse_datetime(value: Any) -> Any:
+    """Convert an SQLite TIMESTAMP string to a datetime, leaving other values untouched"""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def typed_row(row: Sequence) -> tuple:
+    """Restore Python types for a raw export row from the database"""
+    return (row[0], row[1], row[2], row[3], _parse_date(row[4]), _parse_datetime(row[5]))
+
+
+class ExportWriter(ABC):
+    """Base class for streaming export writers
+
+    Subclasses write one row at a time so an export never holds the whole
+    result set in memory.
+    """
+
+    name: str = ""
+    extension: str = ""
+    binary: bool = False
+
+    def __init__(self, stream: IO, columns: List[str]):
+        self.stream = stream
+        self.columns = columns
+
+    @classmethod
+    def open_kwargs(cls) -> Dict[str, Any]:
+        """Keyword arguments used to open the output file for this writer"""
+        if cls.binary:
+            return {'mode': 'wb'}
+        return {'mode': 'w', 'newline': '', 'encoding': 'utf-8'}
+
+    def write_header(self) -> None:
+        """Write anything that precedes the rows"""
+
+    @abstractmethod
+    def write_row(self, row: Sequence) -> None:
+        """Write a single typed row"""
+
+    def write_rows(self, rows: Iterable[Sequence]) -> int:
+        """Write all rows and return how many were written"""
+        count = 0
+        for row in rows:
+            self.write_row(row)
+            count += 1
+        return count
+
+
+class CsvWriter(ExportWriter):
+    """Comma-separated values, with a human readable header row"""
+
+    name = "csv"
+    extension = ".csv"
+    headers = ['ID', 'Project', 'Duration (minutes)', 'Description', 'Date', 'Created At']
+
+    def __init__(self, stream: IO, columns: List[str]):
+        super().__init__(stream, columns)
+        self._writer = csv.writer(stream)
+
+    def write_header(self) -> None:
+        self._writer.writerow(self.headers)
+
+    def write_row(self, row: Sequence) -> None:
+        self._writer.writerow(row)
+
+
+class JsonLinesWriter(ExportWriter):
+    """One JSON object per line
+
+    Integers stay integers. Dates and timestamps use ISO 8601; timestamps
+    carry an explicit UTC offset because SQLite stores them in UTC.
+    """
+
+    name = "jsonl"
+    extension = ".jsonl"
+
+    def __init__(self, stream: IO, columns: List[str]):
+        super().__init__(stream, columns)
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=self._default)
+
+    @staticmethod
+    def _default(value: Any) -> Any:
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return value.isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def write_row(self, row: Sequence) -> None:
+        self.stream.write(self._encoder.encode(dict(zip(self.columns, row))))
+        self.stream.write("\n")
+
+
+class MsgpackWriter(ExportWriter):
+    """Compact MessagePack stream
+
+    The first object is an array with the column names, followed by one
+    array per row. Timestamps such as created_at use the MessagePack
+    timestamp extension (type -1) in UTC, so decoders restore them as
+    datetimes. MessagePack has no calendar date type, so dates such as
+    entry_date are written as ISO 8601 strings, the same as in JSON Lines.
+    Only the subset of the format needed for time entries is implemented.
+    """
+
+    name = "msgpack"
+    extension = ".msgpack"
+    binary = True
+
+    def write_header(self) -> None:
+        self.stream.write(self._pack_array(self.columns))
+
+    def write_row(self, row: Sequence) -> None:
+        self.stream.write(self._pack_array(row))
+
+    def _pack_array(self, values: Sequence) -> bytes:
+        size = len(values)
+        if size < 16:
+            head = struct.pack('B', 0x90 | size)
+        elif size < 0x10000:
+            head = struct.pack('>BH', 0xdc, size)
+        else:
+            head = struct.pack('>BI', 0xdd, size)
+        return head + b''.join(self._pack(value) for value in values)
+
+    def _pack(self, value: Any) -> bytes:
+        if value is None:
+            return b'\xc0'
+        if value is True:
+            return b'\xc3'
+        if value is False:
+            return b'\xc2'
+        if isinstance(value, int):
+            return self._pack_int(value)
+        if isinstance(value, float):
+            return struct.pack('>Bd', 0xcb, value)
+        if isinstance(value, str):
+            return self._pack_str(value)
+        if isinstance(value, datetime):
+            return self._pack_timestamp(value)
+        if isinstance(value, date):
+            return self._pack_str(value.isoformat())
+        raise TypeError(f"Cannot encode value of type {type(value).__name__}")
+
+    @staticmethod
+    def _pack_int(value: int) -> bytes:
+        if value >= 0:
+            if value < 0x80:
+                return struct.pack('B', value)
+            if value < 0x100:
+                return struct.pack('>BB', 0xcc, value)
+            if value < 0x10000:
+                return struct.pack('>BH', 0xcd, value)
+            if value < 0x100000000:
+                return struct.pack('>BI', 0xce, value)
+            return struct.pack('>BQ', 0xcf, value)
+        if value >= -32:
+            return struct.pack('b', value)
+        if value >= -0x80:
+            return struct.pack('>Bb', 0xd0, value)
+        if value >= -0x8000:
+            return struct.pack('>Bh', 0xd1, value)
+        if value >= -0x80000000:
+            return struct.pack('>Bi', 0xd2, value)
+        return struct.pack('>Bq', 0xd3, value)
+
+    @staticmethod
+    def _pack_str(value: str) -> bytes:
+        data = value.encode('utf-8')
+        size = len(data)
+        if size < 32:
+            head = struct.pack('B', 0xa0 | size)
+        elif size < 0x100:
+            head = struct.pack('>BB', 0xd9, size)
+        elif size < 0x10000:
+            head = struct.pack('>BH', 0xda, size)
+        else:
+            head = struct.pack('>BI', 0xdb, size)
+        return head + data
+
+    @staticmethod
+    def _pack_timestamp(value: datetime) -> bytes:
+        # SQLite timestamps are stored in UTC without an offset
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+        seconds = delta.days * 86400 + delta.seconds
+        nanoseconds = delta.microseconds * 1000
+        if nanoseconds == 0 and 0 <= seconds < 0x100000000:
+            return struct.pack('>BbI', 0xd6, -1, seconds)
+        return struct.pack('>BBbIq', 0xc7, 12, -1, nanoseconds, seconds)
+
+
+WRITERS: Dict[str, Type[ExportWriter]] = {}
+
+
+def register_writer(writer_class: Type[ExportWriter]) -> Type[ExportWriter]:
+    """Register an export writer under its format name"""
+    if getattr(writer_class, '__abstractmethods__', None):
+        missing = ', '.join(sorted(writer_class.__abstractmethods__))
+        raise TypeError(f"Export writer {writer_class.__name__} does not implement {missing}")
+    if not writer_class.name:
+        raise ValueError(f"Export writer {writer_class.__name__} has no format name")
+    WRITERS[writer_class.name] = writer_class
+    return writer_class
+
+
+def get_writer(name: str) -> Type[ExportWriter]:
+    """Look up an export writer by format name"""
+    try:
+        return WRITERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown export format '{name}'") from None
+
+
+for _writer_class in (CsvWriter, JsonLinesWriter, MsgpackWriter):
+    register_writer(_writer_class)
@@ -0,0 +1,33 @@
+import pytest
+from click.testing import CliRunner
+
+from src.time_tracker.cli import cli
+from src.time_tracker.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A fresh database with a single project (id 1)"""
+    database = Database(str(tmp_path / "db.sqlite"))
+    database.create_project("Project")
+    return database
+
+
+@pytest.fixture
+def run_cli(tmp_path, monkeypatch):
+    """Run the CLI in a temporary working directory, so it uses ./data/db.sqlite there"""
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+
+    def run(*args, input=None):
+        return runner.invoke(cli, list(args), input=input)
+
+    return run
+
+
+@pytest.fixture
+def cli_db(tmp_path, run_cli):
+    """Database used by run_cli, with a single project (id 1)"""
+    run_cli("project", "add", "Project")
+    return Database(str(tmp_path / "data" / "db.sqlite"))
+
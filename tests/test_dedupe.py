@@ -0,0 +1,151 @@
+import sqlite3
+
+import pytest
+
+
+ENTRY = (1, 45, "same", "2024-01-02")
+
+
+@pytest.fixture
+def keys(db):
+    """Return (id, idempotency_key) for every time entry, ordered by id"""
+    def fetch():
+        with sqlite3.connect(db.db_path) as conn:
+            return conn.execute("SELECT id, idempotency_key FROM time_entries ORDER BY id").fetchall()
+
+    return fetch
+
+
+class TestCreate:
+    def test_unkeyed_entries_are_always_inserted(self, db, keys):
+        assert db.create_time_entry(*ENTRY) is True
+        assert db.create_time_entry(*ENTRY) is True
+        assert [key for _, key in keys()] == [None, None]
+
+    def test_external_id_is_inserted_once(self, db):
+        assert db.create_time_entry(*ENTRY, external_id="E1") is True
+        assert db.create_time_entry(*ENTRY, external_id="E1") is False
+        assert db.create_time_entry(*ENTRY, external_id="E2") is True
+
+    def test_content_key_is_inserted_once(self, db):
+        assert db.create_time_entry(*ENTRY, dedupe=True) is True
+        assert db.create_time_entry(*ENTRY, dedupe=True) is False
+        assert db.create_time_entry(1, 46, "same", "2024-01-02", dedupe=True) is True
+
+    def test_content_key_without_date_uses_today(self, db):
+        assert db.create_time_entry(1, 45, "today", dedupe=True) is True
+        assert db.create_time_entry(1, 45, "today", dedupe=True) is False
+
+    def test_failed_insert_is_not_a_skip(self, db):
+        assert db.create_time_entry(1, 45, None, "2024-01-02", dedupe=True) is None
+
+
+class TestBulkCreate:
+    def test_keys_match_single_inserts(self, db, keys):
+        entries = [(1, 5, "bulk", "2024-02-01"), (1, 5, "bulk", "2024-02-01"), (1, 10, "ext", None, "B1")]
+        assert db.create_time_entries(entries, dedupe=True) == 2
+        assert db.create_time_entries(entries, dedupe=True) == 0
+        assert db.create_time_entry(1, 5, "bulk", "2024-02-01", dedupe=True) is False
+        # Without dedupe only external ids are keyed, as with create_time_entry
+        assert db.create_time_entries(entries) == 2
+        assert len(keys()) == 4
+
+    @pytest.mark.parametrize("dedupe", [False, True])
+    def test_failed_batch_inserts_nothing(self, db, keys, dedupe):
+        entries = [(1, 5, "ok", "2024-02-01"), (1, 5, None, "2024-02-01")]
+        assert db.create_time_entries(entries, dedupe=dedupe) is None
+        assert keys() == []
+
+
+class TestUpdate:
+    def test_content_key_is_recomputed(self, db, keys):
+        db.create_time_entry(1, 45, "edited", "2024-01-04", dedupe=True)
+        entry_id = keys()[-1][0]
+        assert db.update_time_entry(entry_id, duration_minutes=60) is True
+
+        assert db.create_time_entry(1, 45, "edited", "2024-01-04", dedupe=True) is True
+        assert db.create_time_entry(1, 60, "edited", "2024-01-04", dedupe=True) is False
+
+    def test_clash_with_keyed_entry_is_refused(self, db):
+        db.create_time_entry(1, 45, "a", "2024-01-04", dedupe=True)
+        db.create_time_entry(1, 60, "a", "2024-01-04", dedupe=True)
+        assert db.update_time_entry(2, duration_minutes=45) is None
+        assert db.get_time_entry_by_id(2)[2] == 60
+
+    def test_external_key_is_kept(self, db, keys):
+        db.create_time_entry(*ENTRY, external_id="E1")
+        assert db.update_time_entry(1, description="changed") is True
+        assert keys() == [(1, "ext:E1")]
+
+    def test_missing_entry(self, db):
+        assert db.update_time_entry(99, duration_minutes=1) is False
+
+
+class TestDedupe:
+    def test_mixed_keys(self, db, keys):
+        db.create_time_entry(*ENTRY)
+        db.create_time_entry(*ENTRY)
+        db.create_time_entry(*ENTRY, external_id="E1")
+        db.create_time_entry(*ENTRY, external_id="E2")
+        db.create_time_entry(*ENTRY, dedupe=True)
+
+        assert db.count_duplicate_time_entries() == 2
+        assert db.dedupe_time_entries() == 2
+        assert db.count_duplicate_time_entries() == 0
+        assert db.dedupe_time_entries() == 0
+
+        remaining = keys()
+        assert [row[0] for row in remaining] == [3, 4, 5]
+        assert [key for _, key in remaining[:2]] == ["ext:E1", "ext:E2"]
+        assert remaining[2][1].startswith("sha256:")
+
+    def test_replays_after_dedupe_are_skipped(self, db, keys):
+        db.create_time_entry(*ENTRY)
+        db.create_time_entry(*ENTRY, external_id="E1")
+        db.create_time_entry(*ENTRY, external_id="E2")
+        db.create_time_entry(*ENTRY, dedupe=True)
+        db.dedupe_time_entries()
+
+        assert db.create_time_entry(*ENTRY, external_id="E1") is False
+        assert db.create_time_entry(*ENTRY, external_id="E2") is False
+        assert db.create_time_entry(*ENTRY, dedupe=True) is False
+        assert len(keys()) == 3
+
+    def test_unkeyed_survivor_gets_content_key(self, db, keys):
+        db.create_time_entry(*ENTRY)
+        db.create_time_entry(*ENTRY)
+        db.create_time_entry(1, 30, "unique", "2024-01-02")
+
+        assert db.dedupe_time_entries() == 1
+        remaining = keys()
+        assert [row[0] for row in remaining] == [1, 3]
+        assert all(key.startswith("sha256:") for _, key in remaining)
+        assert db.create_time_entry(*ENTRY, dedupe=True) is False
+
+    def test_different_content_is_kept(self, db):
+        db.create_time_entry(1, 45, "a", "2024-01-02")
+        db.create_time_entry(1, 45, "a", "2024-01-03")
+        db.create_time_entry(1, 45, "b", "2024-01-02")
+        assert db.dedupe_time_entries() == 0
+
+
+class TestCli:
+    def test_add_reports_skip_and_failure(self, cli_db, run_cli, monkeypatch):
+        args = ["time", "add", "1", "45", "same", "--date", "2024-01-02", "--dedupe"]
+        assert "Time entry added" in run_cli(*args).output
+        assert "already exists, skipped" in run_cli(*args).output
+
+        monkeypatch.setattr(type(cli_db), "create_time_entry", lambda *a, **kw: None)
+        assert "Failed to add time entry." in run_cli(*args).output
+
+    def test_update_reports_duplicate(self, cli_db, run_cli):
+        cli_db.create_time_entry(1, 45, "a", "2024-01-04", dedupe=True)
+        cli_db.create_time_entry(1, 60, "a", "2024-01-04", dedupe=True)
+        result = run_cli("time", "update", "2", "--duration", "45", "--description", "a", "--date", "2024-01-04")
+        assert "not updated: the new values duplicate an existing entry" in result.output
+
+    def test_db_dedupe(self, cli_db, run_cli):
+        cli_db.create_time_entry(*ENTRY)
+        cli_db.create_time_entry(*ENTRY)
+        assert "Removed 1 duplicate time entries." in run_cli("db", "dedupe", "--yes").output
+        assert "No duplicate time entries found." in run_cli("db", "dedupe").output
@@ -0,0 +1,186 @@
+import csv
+import json
+import sqlite3
+from datetime import date, datetime, timezone
+
+import pytest
+
+from src.time_tracker.export import (
+    COLUMNS,
+    WRITERS,
+    ExportWriter,
+    MsgpackWriter,
+    register_writer,
+)
+
+
+@pytest.fixture
+def entries(db):
+    """Three entries over two projects, plus one with an invalid stored date"""
+    db.create_project("Other")
+    db.create_time_entry(1, 30, 'fixed "login", again', "2024-01-05")
+    db.create_time_entry(1, 300, "review", "2024-01-15")
+    db.create_time_entry(2, 45, "meeting", "2024-02-01")
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute(
+            "INSERT INTO time_entries (project_id, duration_minutes, description, entry_date) VALUES (1, 5, 'bad', 'garbage')"
+        )
+    return db
+
+
+def descriptions(rows, column):
+    return sorted(row[column] for row in rows)
+
+
+class TestFilters:
+    def test_date_range(self, entries):
+        rows = entries.get_all_time_entries("2024-01-06", "2024-01-31")
+        assert descriptions(rows, 4) == ["review"]
+
+    def test_project_and_date(self, entries):
+        rows = entries.get_time_entries_by_project(1, start_date="2024-01-01")
+        assert descriptions(rows, 3) == ['fixed "login", again', "review"]
+
+    def test_invalid_stored_date_never_matches(self, entries):
+        assert entries.get_all_time_entries(start_date="2030-01-01") == []
+        assert "bad" not in descriptions(entries.get_all_time_entries(end_date="2030-01-01"), 4)
+
+    def test_export_uses_same_filters(self, entries):
+        rows = list(entries.iter_export_rows(1, "2024-01-06", "2024-12-31"))
+        assert [row[3] for row in rows] == ["review"]
+
+    def test_cli_normalizes_dates(self, cli_db, run_cli):
+        cli_db.create_time_entry(1, 30, "x", "2024-01-15")
+        result = run_cli("time", "export", "out", "--format", "jsonl", "--start-date", "2024-1-6")
+        assert result.exit_code == 0, result.output
+        assert "(1 rows)" in result.output
+
+    @pytest.mark.parametrize("command", [["list"], ["export", "out"]])
+    def test_cli_rejects_bad_dates(self, cli_db, run_cli, command):
+        result = run_cli("time", *command, "--start-date", "15/01/2024")
+        assert result.exit_code == 2
+        assert "Invalid value for '--start-date'" in result.output
+
+
+class TestWriters:
+    def export(self, db, tmp_path, fmt):
+        filename = tmp_path / f"out{WRITERS[fmt].extension}"
+        assert db.export(str(filename), fmt, project_id=1, start_date="2024-01-01") == 2
+        return filename
+
+    def test_csv(self, entries, tmp_path):
+        with open(self.export(entries, tmp_path, "csv"), newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["ID", "Project", "Duration (minutes)", "Description", "Date", "Created At"]
+        assert [row[1:5] for row in rows[1:]] == [
+            ["Project", "300", "review", "2024-01-15"],
+            ["Project", "30", 'fixed "login", again', "2024-01-05"],
+        ]
+
+    def test_jsonl(self, entries, tmp_path):
+        with open(self.export(entries, tmp_path, "jsonl"), encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        assert list(rows[0]) == COLUMNS
+        assert rows[0]["duration_minutes"] == 300
+        assert rows[0]["entry_date"] == "2024-01-15"
+        assert datetime.fromisoformat(rows[0]["created_at"]).tzinfo == timezone.utc
+
+    def test_msgpack(self, entries, tmp_path):
+        msgpack = pytest.importorskip("msgpack")
+        with open(self.export(entries, tmp_path, "msgpack"), "rb") as f:
+            objects = list(msgpack.Unpacker(f, timestamp=3))
+        assert objects[0] == COLUMNS
+        assert [row[1:5] for row in objects[1:]] == [
+            ["Project", 300, "review", "2024-01-15"],
+            ["Project", 30, 'fixed "login", again', "2024-01-05"],
+        ]
+        assert objects[1][5].tzinfo == timezone.utc
+
+    @pytest.mark.parametrize("value", [
+        0, 127, 128, 255, 256, 65535, 65536, 2**32 - 1, 2**32, 2**64 - 1,
+        -1, -32, -33, -128, -129, -32768, -32769, -2**31, -2**31 - 1, -2**63,
+        None, True, False, 1.5, "", "a" * 31, "a" * 32, "é" * 200, "a" * 70000,
+        datetime(2024, 1, 15, 10, 30), datetime(2024, 1, 15, 10, 30, 0, 250000),
+        datetime(1960, 1, 1), date(2024, 1, 15),
+    ])
+    def test_msgpack_values_round_trip(self, value):
+        msgpack = pytest.importorskip("msgpack")
+        decoded = msgpack.unpackb(MsgpackWriter(None, COLUMNS)._pack(value), timestamp=3)
+        if isinstance(value, datetime):
+            assert decoded == value.replace(tzinfo=timezone.utc)
+        elif isinstance(value, date):
+            assert decoded == value.isoformat()
+        else:
+            assert decoded == value
+
+    @pytest.mark.parametrize("value, encoded", [
+        (5, b"\x05"),
+        (200, b"\xcc\xc8"),
+        (300, b"\xcd\x01\x2c"),
+        (-5, b"\xfb"),
+        (-100, b"\xd0\x9c"),
+        ("ab", b"\xa2ab"),
+        (datetime(1970, 1, 1, 0, 0, 1), b"\xd6\xff\x00\x00\x00\x01"),
+    ])
+    def test_msgpack_encoding(self, value, encoded):
+        assert MsgpackWriter(None, COLUMNS)._pack(value) == encoded
+
+
+class TestRegistry:
+    def test_incomplete_writer_is_rejected(self):
+        class Incomplete(ExportWriter):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            register_writer(Incomplete)
+        with pytest.raises(TypeError):
+            Incomplete(None, COLUMNS)
+        assert "incomplete" not in WRITERS
+
+    def test_writer_registered_later_is_available_in_cli(self, cli_db, run_cli, tmp_path):
+        class TsvWriter(ExportWriter):
+            name = "tsv"
+            extension = ".tsv"
+
+            def write_row(self, row):
+                self.stream.write("\t".join(str(value) for value in row) + "\n")
+
+        cli_db.create_time_entry(1, 30, "x", "2024-01-15")
+        register_writer(TsvWriter)
+        try:
+            result = run_cli("time", "export", "out", "--format", "tsv")
+        finally:
+            WRITERS.pop("tsv")
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / "out.tsv").read_text().startswith("1\tProject\t30\tx\t2024-01-15\t")
+
+    def test_unknown_format_is_rejected(self, cli_db, run_cli):
+        result = run_cli("time", "export", "out", "--format", "xml")
+        assert result.exit_code == 2
+        assert "'xml' is not one of csv, jsonl, msgpack" in result.output
+
+
+class TestExportFailure:
+    class FailingWriter(ExportWriter):
+        name = "failing"
+        error = ValueError
+
+        def write_row(self, row):
+            self.stream.write("partial\n")
+            raise self.error("boom")
+
+    def test_partial_file_is_removed(self, entries, tmp_path, monkeypatch):
+        monkeypatch.setitem(WRITERS, "failing", self.FailingWriter)
+        filename = tmp_path / "out.txt"
+        assert entries.export(str(filename), "failing") is None
+        assert not filename.exists()
+
+    def test_writer_bugs_propagate(self, entries, tmp_path, monkeypatch):
+        monkeypatch.setattr(self.FailingWriter, "error", TypeError)
+        monkeypatch.setitem(WRITERS, "failing", self.FailingWriter)
+        with pytest.raises(TypeError):
+            entries.export(str(tmp_path / "out.txt"), "failing")
+
+    def test_existing_file_kept_when_open_fails(self, entries, tmp_path):
+        assert entries.export(str(tmp_path), "csv") is None
+        assert tmp_path.is_dir()